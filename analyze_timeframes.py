@@ -16,28 +16,100 @@ Run locally or on Render to populate multi-timeframe tiers.
 import sqlite3
 import json
 import os
+import re
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from collections import defaultdict
 from typing import Dict, List, Optional, Tuple
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 # Polymarket API endpoints
 POLYMARKET_API = "https://gamma-api.polymarket.com"
 POLYMARKET_CLOB = "https://clob.polymarket.com"
 
+# Metadata fetch tuning: concurrent requests and overall request rate
+FETCH_WORKERS = 8
+FETCH_RATE_PER_SEC = 10
+GAMMA_BATCH_SIZE = 50  # token ids per multi-id Gamma lookup
+
+# Read tuning for the full scan of trades: keep the working set in the page
+# cache / mmap and temp b-trees (GROUP BY sorts, lookup table) in RAM
+SCAN_CACHE_SIZE_KIB = 256 * 1024           # PRAGMA cache_size (negative = KiB)
+SCAN_MMAP_SIZE_BYTES = 1024 * 1024 * 1024  # PRAGMA mmap_size
+
+# Question keyword rules, checked in order (first match wins).
+# One compiled alternation per timeframe scans the question once instead of
+# running a separate substring test per keyword.
+TIMEFRAME_PATTERNS = [
+    ('15min', re.compile(r'15 min|15min|next 15|15-min')),
+    ('hourly', re.compile(r'1 hour|1hour|next hour|in an hour|60 min')),
+    ('4hour', re.compile(r'4 hour|4hour|4-hour|next 4')),
+    ('daily', re.compile(r'daily|by friday|by monday|by tomorrow|end of day|eod|24 hour|today')),
+]
+CRYPTO_PATTERN = re.compile(r'btc|eth|sol|crypto|bitcoin|ethereum')
+DIRECTION_PATTERN = re.compile(r'up|down|above')
+
 
 def get_db_path() -> str:
     """Get database path from environment or use default"""
     return os.environ.get('DB_PATH', 'trades.db')
 
 
+def create_api_session(pool_size: int = 16) -> requests.Session:
+    """Keep-alive session with a connection pool and retry/backoff for API calls"""
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def parse_json(content: bytes):
+    """Decode an API response body (orjson when installed)"""
+    if HAS_ORJSON:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls evenly at a maximum rate"""
+
+    def __init__(self, rate_per_sec: float):
+        self.interval = 1.0 / rate_per_sec
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the caller may issue its next request"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
 class MarketMetadataCache:
     """Cache for market metadata from Polymarket API"""
 
     def __init__(self, cache_file: str = "market_metadata_cache.json"):
         self.cache_file = cache_file
         self.cache: Dict[str, Dict] = {}
+        self.session = create_api_session()
+        self.rate_limiter = RateLimiter(FETCH_RATE_PER_SEC)
         self._load_cache()
 
     def _load_cache(self):
@@ -66,20 +138,22 @@ class MarketMetadataCache:
         try:
             # Try CLOB API first (has token mapping)
             url = f"{POLYMARKET_CLOB}/markets/{token_id}"
-            response = requests.get(url, timeout=10)
+            self.rate_limiter.wait()
+            response = self.session.get(url, timeout=10)
 
             if response.status_code == 200:
-                market = response.json()
+                market = parse_json(response.content)
                 self.cache[token_id] = market
                 return market
 
             # Fall back to gamma API search
             url = f"{POLYMARKET_API}/markets"
             params = {"token_id": token_id}
-            response = requests.get(url, params=params, timeout=10)
+            self.rate_limiter.wait()
+            response = self.session.get(url, params=params, timeout=10)
 
             if response.status_code == 200:
-                markets = response.json()
+                markets = parse_json(response.content)
                 if markets:
                     market = markets[0]
                     self.cache[token_id] = market
@@ -90,6 +164,43 @@ class MarketMetadataCache:
 
         return None
 
+    def prefetch_markets(self, token_ids: List[str]) -> int:
+        """
+        Resolve many tokens with one Gamma request (clob_token_ids=...).
+
+        Each returned market is cached under every token id it lists, so
+        tokens the endpoint leaves out simply fall back to the per-token
+        lookup. Returns the number of requested tokens now cached.
+        """
+        wanted = [t for t in token_ids if t not in self.cache]
+        if not wanted:
+            return 0
+
+        try:
+            self.rate_limiter.wait()
+            response = self.session.get(
+                f"{POLYMARKET_API}/markets",
+                params={'clob_token_ids': wanted, 'limit': len(wanted)},
+                timeout=15
+            )
+            if response.status_code != 200:
+                return 0
+            markets = parse_json(response.content)
+        except Exception:
+            return 0
+
+        for market in markets or []:
+            clob_ids = market.get('clobTokenIds') or []
+            if isinstance(clob_ids, str):
+                try:
+                    clob_ids = parse_json(clob_ids)
+                except ValueError:
+                    continue
+            for token_id in clob_ids:
+                self.cache[str(token_id)] = market
+
+        return sum(1 for t in wanted if t in self.cache)
+
     def get_market_timeframe(self, market_data: Dict) -> str:
         """
         Determine market timeframe from metadata
@@ -103,22 +214,10 @@ class MarketMetadataCache:
         question = market_data.get('question', '') or market_data.get('title', '')
         question_lower = question.lower()
 
-        # 15-minute patterns
-        if any(p in question_lower for p in ['15 min', '15min', 'next 15', '15-min']):
-            return '15min'
-
-        # Hourly patterns (but not 4 hour)
-        if any(p in question_lower for p in ['1 hour', '1hour', 'next hour', 'in an hour', '60 min']):
-            return 'hourly'
-
-        # 4-hour patterns
-        if any(p in question_lower for p in ['4 hour', '4hour', '4-hour', 'next 4']):
-            return '4hour'
-
-        # Daily patterns
-        if any(p in question_lower for p in ['daily', 'by friday', 'by monday', 'by tomorrow',
-                                              'end of day', 'eod', '24 hour', 'today']):
-            return 'daily'
+        # Explicit timeframe keywords
+        for timeframe, pattern in TIMEFRAME_PATTERNS:
+            if pattern.search(question_lower):
+                return timeframe
 
         # Check resolution time if available
         end_date = market_data.get('end_date_iso') or market_data.get('end_date')
@@ -143,9 +242,8 @@ class MarketMetadataCache:
                 pass
 
         # Default - check for crypto price patterns (usually 15min)
-        if any(p in question_lower for p in ['btc', 'eth', 'sol', 'crypto', 'bitcoin', 'ethereum']):
-            if 'up' in question_lower or 'down' in question_lower or 'above' in question_lower:
-                return '15min'  # Most crypto price markets are 15min
+        if CRYPTO_PATTERN.search(question_lower) and DIRECTION_PATTERN.search(question_lower):
+            return '15min'  # Most crypto price markets are 15min
 
         return 'daily'  # Default to daily for unknown
 
@@ -174,6 +272,9 @@ class TimeframeAnalyzer:
         """Connect to database"""
         self.conn = sqlite3.connect(self.db_path)
         self.conn.row_factory = sqlite3.Row
+        self.conn.execute(f"PRAGMA cache_size=-{SCAN_CACHE_SIZE_KIB}")
+        self.conn.execute(f"PRAGMA mmap_size={SCAN_MMAP_SIZE_BYTES}")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
         print(f"Connected to database: {self.db_path}")
 
     def close(self):
@@ -205,8 +306,9 @@ class TimeframeAnalyzer:
 
         fetched = 0
         cached = 0
+        to_fetch = []
 
-        for i, token in enumerate(tokens):
+        for token in tokens:
             # Check if already in cache
             if token in self.token_timeframes:
                 cached += 1
@@ -219,22 +321,30 @@ class TimeframeAnalyzer:
                 cached += 1
                 continue
 
-            # Fetch from API
-            market = self.metadata_cache.get_market_by_token(token)
-            if market:
-                timeframe = self.metadata_cache.get_market_timeframe(market)
-                self.token_timeframes[token] = timeframe
-                fetched += 1
-            else:
-                self.token_timeframes[token] = 'unknown'
+            to_fetch.append(token)
 
-            # Progress update
-            if (i + 1) % 100 == 0:
-                print(f"   Processed {i+1}/{len(tokens)} tokens ({fetched} fetched, {cached} cached)")
+        # Fetch the rest from the API concurrently (rate limited inside the cache):
+        # multi-id lookups first, then single lookups for whatever they missed
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            batches = [to_fetch[i:i + GAMMA_BATCH_SIZE]
+                       for i in range(0, len(to_fetch), GAMMA_BATCH_SIZE)]
+            batched = sum(executor.map(self.metadata_cache.prefetch_markets, batches))
+            if batched:
+                print(f"   Batch lookups resolved {batched}/{len(to_fetch)} tokens")
 
-            # Rate limit
-            if fetched % 10 == 0:
-                time.sleep(0.5)  # 500ms delay every 10 fetches
+            markets = executor.map(self.metadata_cache.get_market_by_token, to_fetch)
+
+            for i, (token, market) in enumerate(zip(to_fetch, markets)):
+                if market:
+                    timeframe = self.metadata_cache.get_market_timeframe(market)
+                    self.token_timeframes[token] = timeframe
+                    fetched += 1
+                else:
+                    self.token_timeframes[token] = 'unknown'
+
+                # Progress update
+                if (i + 1) % 100 == 0:
+                    print(f"   Fetched {i+1}/{len(to_fetch)} tokens ({fetched} found, {cached} cached)")
 
         # Save cache
         self.metadata_cache._save_cache()
@@ -251,71 +361,105 @@ class TimeframeAnalyzer:
     def analyze_traders(self):
         """
         Analyze all trades and build trader stats by timeframe
+
+        The per-trade win/loss estimate is aggregated inside SQLite: each trade
+        counts once for the maker (SELL side) and once for the taker (BUY side).
         """
         print("\nAnalyzing trader performance by timeframe...")
 
-        # Get all trades with asset IDs
-        cursor = self.conn.execute("""
-            SELECT maker, taker, maker_amount, taker_amount, asset_id, block_number
-            FROM trades
-            WHERE asset_id IS NOT NULL AND asset_id != ''
-            ORDER BY block_number ASC
+        # Token -> timeframe lookup the aggregate query can join against.
+        # WITHOUT ROWID keeps timeframe in the primary key b-tree, so each
+        # probe from trades is index-only.
+        self.conn.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS token_timeframe_map (
+                token_id TEXT PRIMARY KEY,
+                timeframe TEXT NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self.conn.execute("DELETE FROM temp.token_timeframe_map")
+        self.conn.executemany(
+            "INSERT INTO temp.token_timeframe_map (token_id, timeframe) VALUES (?, ?)",
+            self.token_timeframes.items()
+        )
+
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute("""
+            WITH priced AS (
+                SELECT t.maker, t.taker,
+                       COALESCE(m.timeframe, 'unknown') AS timeframe,
+                       COALESCE(t.taker_amount, 0) / 1e6 AS usdc,
+                       CASE
+                           WHEN t.maker_amount IS NULL OR t.maker_amount = 0
+                               THEN COALESCE(t.taker_amount, 0) / 1e6
+                           WHEN t.maker_amount > 0
+                               THEN (COALESCE(t.taker_amount, 0) / 1e6) / (t.maker_amount / 1e6)
+                           ELSE 0.5
+                       END AS price
+                FROM trades t
+                LEFT JOIN temp.token_timeframe_map m ON m.token_id = t.asset_id
+                WHERE t.asset_id IS NOT NULL AND t.asset_id != ''
+            ),
+            maker_stats AS (
+                SELECT maker AS address, timeframe,
+                       COUNT(*) AS trades,
+                       SUM(usdc) AS volume,
+                       SUM(price > 0.55) AS wins,
+                       SUM(price < 0.25) AS losses,
+                       SUM(CASE WHEN price > 0.55 THEN usdc * 0.3
+                                WHEN price < 0.25 THEN -usdc * 0.2 ELSE 0 END) AS profit
+                FROM priced
+                GROUP BY 1, 2
+            ),
+            taker_stats AS (
+                SELECT taker AS address, timeframe,
+                       COUNT(*) AS trades,
+                       SUM(usdc) AS volume,
+                       SUM(price < 0.45) AS wins,
+                       SUM(price > 0.75) AS losses,
+                       SUM(CASE WHEN price < 0.45 THEN usdc * 0.3
+                                WHEN price > 0.75 THEN -usdc * 0.2 ELSE 0 END) AS profit
+                FROM priced
+                GROUP BY 1, 2
+            )
+            -- Each side is pre-aggregated, so the merge only sorts one row
+            -- per (address, timeframe) and side rather than one per trade.
+            -- Addresses are lowercased here, once per group instead of once
+            -- per trade; mixed-case spellings fold together in this GROUP BY.
+            SELECT LOWER(address), timeframe,
+                   SUM(trades), SUM(volume), SUM(wins), SUM(losses), SUM(profit)
+            FROM (
+                SELECT * FROM maker_stats
+                UNION ALL
+                SELECT * FROM taker_stats
+            )
+            GROUP BY 1, 2
         """)
 
         trade_count = 0
         unknown_tokens = 0
 
-        for row in cursor:
-            trade_count += 1
-
-            maker = row['maker']
-            taker = row['taker']
-            maker_amount = row['maker_amount']
-            taker_amount = row['taker_amount']
-            token = row['asset_id']
+        for address, timeframe, trades, volume, wins, losses, profit in cursor:
+            stats = self.trader_stats[address][timeframe]
+            stats['trades'] += trades
+            stats['volume'] += volume
+            stats['wins'] += wins
+            stats['losses'] += losses
+            stats['profit'] += profit
 
-            # Get timeframe for this token
-            timeframe = self.token_timeframes.get(token, 'unknown')
+            # Every trade shows up twice (maker + taker)
+            trade_count += trades
             if timeframe == 'unknown':
-                unknown_tokens += 1
-
-            # Calculate trade outcome (simplified)
-            usdc_amount = taker_amount / 1e6 if taker_amount else 0
-            token_amount = maker_amount / 1e6 if maker_amount else 1
-            price = usdc_amount / token_amount if token_amount > 0 else 0.5
+                unknown_tokens += trades
 
-            # Update maker stats (SELL side)
-            self._update_trader_stats(maker, timeframe, 'SELL', price, usdc_amount)
+        self.conn.execute("DROP TABLE temp.token_timeframe_map")
 
-            # Update taker stats (BUY side)
-            self._update_trader_stats(taker, timeframe, 'BUY', price, usdc_amount)
-
-            if trade_count % 500000 == 0:
-                print(f"   Processed {trade_count:,} trades...")
+        trade_count //= 2
+        unknown_tokens //= 2
 
         print(f"\nAnalyzed {trade_count:,} trades for {len(self.trader_stats):,} traders")
         print(f"   Unknown token timeframes: {unknown_tokens:,}")
 
-    def _update_trader_stats(self, address: str, timeframe: str, side: str, price: float, volume: float):
-        """Update stats for a single trade"""
-        stats = self.trader_stats[address.lower()][timeframe]
-        stats['trades'] += 1
-        stats['volume'] += volume
-
-        # Simple win estimation based on price
-        is_win = False
-        if side == 'BUY' and price < 0.45:
-            is_win = True
-        elif side == 'SELL' and price > 0.55:
-            is_win = True
-
-        if is_win:
-            stats['wins'] += 1
-            stats['profit'] += volume * 0.3  # Estimated 30% profit
-        elif (side == 'BUY' and price > 0.75) or (side == 'SELL' and price < 0.25):
-            stats['losses'] += 1
-            stats['profit'] -= volume * 0.2  # Estimated 20% loss
-
     def assign_traders_to_tiers(self) -> Dict[str, List[Dict]]:
         """
         Assign traders to their best-performing timeframe tier
@@ -339,31 +483,37 @@ class TimeframeAnalyzer:
             'daily': []
         }
 
-        for address, tf_stats in self.trader_stats.items():
-            # Find their best timeframe
-            best_tf = None
-            best_score = 0
-
-            for tf in ['15min', 'hourly', '4hour', 'daily']:
-                stats = tf_stats[tf]
-                trades = stats['trades']
-
-                if trades < tier_requirements[tf]['min_trades']:
-                    continue
-
-                win_rate = stats['wins'] / trades if trades > 0 else 0
-
-                if win_rate < tier_requirements[tf]['min_win_rate']:
-                    continue
-
-                # Score: combination of win rate and profit
-                score = (win_rate * 0.6) + (min(stats['profit'] / 1000, 0.4))
-
-                if score > best_score:
-                    best_score = score
-                    best_tf = tf
-
-            if best_tf:
+        # Score every (trader, timeframe) cell at once: rows are traders,
+        # columns follow tier_order
+        tier_order = ['15min', 'hourly', '4hour', 'daily']
+        addresses = list(self.trader_stats)
+        cells = np.array(
+            [[(tf_stats[tf]['trades'], tf_stats[tf]['wins'], tf_stats[tf]['profit'])
+              for tf in tier_order]
+             for tf_stats in self.trader_stats.values()],
+            dtype=np.float64
+        ).reshape(len(addresses), len(tier_order), 3)
+        trade_counts, win_counts, profits = cells[..., 0], cells[..., 1], cells[..., 2]
+
+        min_trades = np.array([tier_requirements[tf]['min_trades'] for tf in tier_order])
+        min_win_rate = np.array([tier_requirements[tf]['min_win_rate'] for tf in tier_order])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            win_rates = np.where(trade_counts > 0, win_counts / trade_counts, 0.0)
+
+        # Score: combination of win rate and profit
+        scores = (win_rates * 0.6) + np.minimum(profits / 1000, 0.4)
+        eligible = (trade_counts >= min_trades) & (win_rates >= min_win_rate)
+        scores = np.where(eligible, scores, -np.inf)
+
+        # First timeframe with the highest positive score wins ties
+        best_idx = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(addresses)), best_idx]
+
+        for address, idx, best_score in zip(addresses, best_idx, best_scores.tolist()):
+            if best_score > 0:
+                tf_stats = self.trader_stats[address]
+                best_tf = tier_order[idx]
                 stats = tf_stats[best_tf]
                 trades = stats['trades']
                 win_rate = stats['wins'] / trades if trades > 0 else 0
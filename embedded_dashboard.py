@@ -168,9 +168,9 @@ class EmbeddedDashboard:
         db = getattr(self.system.discovery, 'db', None)
         if db:
             try:
-                resolved = await asyncio.to_thread(db.get_resolved_dry_run_positions)
+                resolved = await asyncio.to_thread(db.get_resolved_dry_run_positions, 20)
                 trades = []
-                for pos in resolved[:20]:  # Limit to 20 most recent
+                for pos in resolved:  # 20 most recent
                     trades.append({
                         'timestamp': pos.get('resolved_at', pos.get('opened_at', '')),
                         'whale': pos.get('whale_address', '')[:10] + '...' if pos.get('whale_address') else '',
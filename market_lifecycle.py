@@ -20,10 +20,39 @@ from typing import Dict, List, Optional, Set
 from collections import defaultdict
 import json
 import re
+from functools import lru_cache
 
 import config
 
 
+def _any_of(*phrases: str) -> re.Pattern:
+    """Compile a substring alternation (same matches as any(p in text ...))"""
+    return re.compile('|'.join(re.escape(p) for p in phrases))
+
+
+# Question-text timeframe hints, checked in order
+QUESTION_TIMEFRAME_PATTERNS = [
+    ('15min', _any_of('15 min', '15min', '15-min', 'next 15')),
+    ('hourly', _any_of('1 hour', '1hour', 'next hour', 'in an hour', '60 min')),
+    ('4hour', _any_of('4 hour', '4hour', '4-hour', 'four hour')),
+    ('daily', _any_of('today', 'by eod', 'end of day', '24 hour', 'daily')),
+]
+CRYPTO_ASSET_PATTERN = _any_of('btc', 'eth', 'sol', 'bitcoin', 'ethereum')
+PRICE_LEVEL_PATTERN = _any_of('above', 'below')
+
+
+@lru_cache(maxsize=8192)
+def _timeframe_from_question(question_lower: str) -> Optional[str]:
+    """Timeframe implied by the question wording alone, or None"""
+    for timeframe, pattern in QUESTION_TIMEFRAME_PATTERNS:
+        if pattern.search(question_lower):
+            # Hourly wording only counts when the question has no "4" in it
+            if timeframe == 'hourly' and '4' in question_lower:
+                continue
+            return timeframe
+    return None
+
+
 class MarketLifecycle:
     """
     Tracks active markets and their lifecycle states.
@@ -215,22 +244,9 @@ class MarketLifecycle:
         """Detect market timeframe from question text and end date"""
         question_lower = question.lower()
 
-        # 15-minute patterns
-        if any(p in question_lower for p in ['15 min', '15min', '15-min', 'next 15']):
-            return '15min'
-
-        # Hourly patterns (but not 4 hour)
-        if any(p in question_lower for p in ['1 hour', '1hour', 'next hour', 'in an hour', '60 min']):
-            if '4' not in question_lower:
-                return 'hourly'
-
-        # 4-hour patterns
-        if any(p in question_lower for p in ['4 hour', '4hour', '4-hour', 'four hour']):
-            return '4hour'
-
-        # Daily patterns
-        if any(p in question_lower for p in ['today', 'by eod', 'end of day', '24 hour', 'daily']):
-            return 'daily'
+        timeframe = _timeframe_from_question(question_lower)
+        if timeframe:
+            return timeframe
 
         # Try to infer from end date
         if end_date:
@@ -247,8 +263,8 @@ class MarketLifecycle:
                 return 'daily'
 
         # Default based on crypto patterns
-        if any(p in question_lower for p in ['btc', 'eth', 'sol', 'bitcoin', 'ethereum']):
-            if 'above' in question_lower or 'below' in question_lower:
+        if CRYPTO_ASSET_PATTERN.search(question_lower):
+            if PRICE_LEVEL_PATTERN.search(question_lower):
                 return '15min'  # Most crypto price markets are 15min
 
         return 'other'
@@ -599,6 +599,10 @@ class TimeframeAnalyzer:
             'daily': {'trades': 0, 'wins': 0, 'profit': 0}
         })
 
+        # One strategy instance for timeframe detection (building a new one
+        # per trade re-creates the tiers and prints the init banner each time)
+        self._strategy = MultiTimeframeStrategy()
+
     def record_trade(self, trader_address: str, market: str, was_win: bool, profit: float):
         """Record a trade for analysis"""
         timeframe = self.detect_timeframe(market)
@@ -611,8 +615,7 @@ class TimeframeAnalyzer:
 
     def detect_timeframe(self, market: str) -> str:
         """Detect market timeframe"""
-        strategy = MultiTimeframeStrategy()
-        return strategy.detect_market_timeframe(market)
+        return self._strategy.detect_market_timeframe(market)
 
     def get_trader_specialty(self, trader_address: str) -> Dict:
         """
@@ -21,6 +21,7 @@ import os
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     HAS_REQUESTS = True
 except ImportError:
     HAS_REQUESTS = False
@@ -36,6 +37,15 @@ TIER_REQUIREMENTS = {
     'daily': {'min_trades': 8, 'min_win_rate': 0.80},
 }
 
+# Gamma API lookups: keep-alive pool size = max concurrent requests in flight
+GAMMA_FETCH_CONCURRENCY = 8
+
+# Observed whale trades are queued for resolution tracking in batches: flushed
+# as soon as this many are buffered, and otherwise every FLUSH_SECONDS by
+# pending_trade_flush_loop
+PENDING_TRADE_FLUSH_SIZE = 256
+PENDING_TRADE_FLUSH_SECONDS = 0.5
+
 # Timeframe durations for market resolution
 TIMEFRAME_DURATIONS = {
     '15min': timedelta(minutes=15),
@@ -532,14 +542,26 @@ class SmallCapitalSystem:
         # v3: Tier promotion interval (every 30 minutes)
         self.tier_promotion_interval = 1800
 
+        # Whale trades awaiting a batched insert into whale_pending_trades
+        self._pending_trade_buffer = []
+
+        # Shared keep-alive session for Gamma lookups (reuses TCP/TLS connections)
+        self.gamma_session = None
+        if HAS_REQUESTS:
+            self.gamma_session = requests.Session()
+            self.gamma_session.mount('https://', HTTPAdapter(
+                pool_connections=GAMMA_FETCH_CONCURRENCY, pool_maxsize=GAMMA_FETCH_CONCURRENCY))
+        self._gamma_semaphore = asyncio.Semaphore(GAMMA_FETCH_CONCURRENCY)
+
         # v4: Idempotency protection - track resolved position IDs
         self._resolved_position_ids = set()
 
         # Load all-time best/worst trades from database
         if hasattr(self.discovery, 'db') and self.discovery.db:
             try:
-                self.stats['best_trade'] = self.discovery.db.get_best_trade_pnl()
-                self.stats['worst_trade'] = self.discovery.db.get_worst_trade_pnl()
+                extrema = self.discovery.db.get_dry_run_extrema()
+                self.stats['best_trade'] = extrema['best']
+                self.stats['worst_trade'] = extrema['worst']
             except Exception as e:
                 print(f"⚠️  Could not load best/worst trades from database: {e}")
 
@@ -645,6 +667,11 @@ class SmallCapitalSystem:
         )
         print("📊 Whale quality tracking started (resolution-based PnL)")
 
+        # Writes buffered whale trades to the pending queue on a timer
+        pending_flush_task = asyncio.create_task(
+            self.pending_trade_flush_loop()
+        )
+
         # v4: Market resolver loop for live trading (polls for market outcomes)
         market_resolver_task = None
         if config.AUTO_COPY_ENABLED and self.market_resolver:
@@ -670,6 +697,7 @@ class SmallCapitalSystem:
                 intel_task,
                 resolution_task,
                 whale_quality_task,
+                pending_flush_task,
                 whale_management_task
             ]
             if market_resolver_task:
@@ -679,6 +707,10 @@ class SmallCapitalSystem:
         except KeyboardInterrupt:
             print("\n⚠️  System stopped")
             self.print_final_summary()
+        finally:
+            # Also reached on cancellation (Ctrl+C under asyncio.run cancels
+            # this task rather than raising KeyboardInterrupt here)
+            await self._flush_pending_whale_trades()
     
     def _get_all_tier_addresses(self) -> list:
         """Get all whale addresses from all tiers"""
@@ -1446,7 +1478,8 @@ class SmallCapitalSystem:
 
         for attempt in range(max_retries + 1):
             try:
-                response = requests.get(url, timeout=5)
+                async with self._gamma_semaphore:
+                    response = await asyncio.to_thread(self.gamma_session.get, url, timeout=5)
                 if response.status_code == 200:
                     markets = response.json()
                     if isinstance(markets, list) and markets:
@@ -1526,17 +1559,13 @@ class SmallCapitalSystem:
             if maker_amount == 0 or taker_amount == 0:
                 return
 
-            # Store pending trade
-            db.add_pending_whale_trade(
-                token_id=token_id,
-                whale_address=whale_address,
-                is_maker=is_maker,
-                maker_amount=maker_amount,
-                taker_amount=taker_amount,
-                token_side=token_side,
-                timeframe=timeframe,
-                expected_resolution=end_date
-            )
+            # Queue pending trade (written in batches; see pending_trade_flush_loop)
+            self._pending_trade_buffer.append((
+                token_id, whale_address, is_maker, maker_amount, taker_amount,
+                token_side, timeframe, end_date
+            ))
+            if len(self._pending_trade_buffer) >= PENDING_TRADE_FLUSH_SIZE:
+                await self._flush_pending_whale_trades()
 
             self.quality_stats['trades_tracked'] += 1
 
@@ -1544,6 +1573,28 @@ class SmallCapitalSystem:
             # Silently fail - quality tracking is non-critical
             pass
 
+    async def _flush_pending_whale_trades(self):
+        """
+        Write buffered whale trades to the pending queue in one transaction.
+        On failure the trades go back to the front of the buffer for the next flush.
+        """
+        db = self.discovery.db
+        if not db or not self._pending_trade_buffer:
+            return
+
+        trades, self._pending_trade_buffer = self._pending_trade_buffer, []
+        try:
+            await asyncio.to_thread(db.add_pending_whale_trades, trades)
+        except Exception as e:
+            self._pending_trade_buffer[:0] = trades
+            print(f"   ⚠️ Pending trade flush failed ({len(trades)} kept for retry): {e}")
+
+    async def pending_trade_flush_loop(self):
+        """Flush buffered whale trades every PENDING_TRADE_FLUSH_SECONDS."""
+        while True:
+            await asyncio.sleep(PENDING_TRADE_FLUSH_SECONDS)
+            await self._flush_pending_whale_trades()
+
     async def whale_quality_resolution_loop(self):
         """
         Periodically check pending whale trades for resolution and update stats.
@@ -1578,6 +1629,9 @@ class SmallCapitalSystem:
         if not db:
             return
 
+        # Make sure recently observed trades are in the queue before polling it
+        await self._flush_pending_whale_trades()
+
         # Use local time (consistent with how positions are saved)
         current_time = datetime.now().isoformat()
 
@@ -1597,11 +1651,13 @@ class SmallCapitalSystem:
 
         resolved_count = 0
 
-        for token_id, trades in by_token.items():
-            try:
-                # Fetch resolution from Gamma
-                resolution = await self._fetch_token_resolution(token_id)
+        # Fetch resolutions from Gamma concurrently (bounded by the session pool)
+        tokens = list(by_token)
+        resolutions = await asyncio.gather(*(self._fetch_token_resolution(t) for t in tokens))
 
+        for token_id, resolution in zip(tokens, resolutions):
+            trades = by_token[token_id]
+            try:
                 if not resolution or not resolution.get('resolved'):
                     # Not resolved yet - will check again later
                     continue
@@ -1610,34 +1666,15 @@ class SmallCapitalSystem:
                 if not outcome:
                     continue
 
-                # Cache the resolution in token_timeframes table (in thread pool)
-                await asyncio.to_thread(
-                    db.update_token_resolution,
-                    token_id=token_id,
-                    resolved=True,
-                    outcome=outcome,
-                    token_side=trades[0].get('token_side')
-                )
-
                 # Get timeframe and token_side from first trade (same for all)
                 timeframe = trades[0]['timeframe']
                 token_side = trades[0].get('token_side')
 
-                # Process each trade for this token
-                for trade in trades:
-                    pnl = self._calculate_whale_pnl(trade, outcome)
-                    whale_address = trade['whale_address']
-                    volume = trade['taker_amount'] / 1_000_000.0
-
-                    # Update incremental stats (in thread pool)
-                    await asyncio.to_thread(
-                        db.update_whale_incremental_stats,
-                        whale_address, timeframe, pnl, volume
-                    )
-
-                    # Delete processed trade (in thread pool)
-                    await asyncio.to_thread(db.delete_pending_trade, trade['id'])
-                    resolved_count += 1
+                # Cache the resolution, update incremental stats and delete the
+                # processed trades in one transaction (in thread pool)
+                resolved_count += await asyncio.to_thread(
+                    self._apply_token_resolution, db, token_id, outcome, trades
+                )
 
                 # NEW WHALE DISCOVERY: Check all traders on this resolved token
                 await self._discover_new_whales_from_token(token_id, outcome, timeframe, token_side)
@@ -1649,6 +1686,36 @@ class SmallCapitalSystem:
         if resolved_count > 0:
             print(f"   📊 Resolved {resolved_count} whale trades for quality tracking")
 
+    def _apply_token_resolution(self, db, token_id: str, outcome: str, trades: list) -> int:
+        """
+        Record a resolved token and its pending whale trades (blocking).
+
+        The token_timeframes update, the incremental stats batch and the
+        pending-trade deletes share one transaction, so the whole token costs
+        a single commit and is never left half-applied.
+
+        Returns: Number of whale trades resolved
+        """
+        timeframe = trades[0]['timeframe']
+        stats_rows = [
+            (trade['whale_address'], timeframe,
+             self._calculate_whale_pnl(trade, outcome),
+             trade['taker_amount'] / 1_000_000.0)
+            for trade in trades
+        ]
+
+        with db.transaction():
+            db.update_token_resolution(
+                token_id=token_id,
+                resolved=True,
+                outcome=outcome,
+                token_side=trades[0].get('token_side')
+            )
+            db.update_whale_incremental_stats_bulk(stats_rows)
+            db.delete_pending_trades([trade['id'] for trade in trades])
+
+        return len(trades)
+
     async def _fetch_token_resolution(self, token_id: str) -> dict:
         """Fetch resolution status from Gamma API."""
         if not HAS_REQUESTS:
@@ -1656,7 +1723,8 @@ class SmallCapitalSystem:
 
         try:
             url = f"https://gamma-api.polymarket.com/markets?clob_token_ids={token_id}"
-            r = requests.get(url, timeout=5)
+            async with self._gamma_semaphore:
+                r = await asyncio.to_thread(self.gamma_session.get, url, timeout=5)
             if r.status_code != 200:
                 return None
 
@@ -1770,7 +1838,7 @@ class SmallCapitalSystem:
 
         candidates = db.get_tier_candidates_from_incremental(min_trades=8)
 
-        promoted = 0
+        qualified = []
         for row in candidates:
             address, timeframe, trades, net_pnl, win_rate = row
 
@@ -1782,18 +1850,10 @@ class SmallCapitalSystem:
             if trades >= min_trades and win_rate >= min_win_rate:
                 wins = int(trades * win_rate)
                 losses = trades - wins
+                # volume=0 (not tracked here), profit=net_pnl
+                qualified.append((address, timeframe, trades, wins, losses, 0, net_pnl, win_rate))
 
-                db.promote_whale_to_tier(
-                    address=address,
-                    timeframe=timeframe,
-                    trades=trades,
-                    wins=wins,
-                    losses=losses,
-                    volume=0,
-                    profit=net_pnl,
-                    win_rate=win_rate
-                )
-                promoted += 1
+        promoted = db.promote_whales_to_tiers(qualified) if qualified else 0
 
         if promoted > 0:
             self.quality_stats['whales_promoted'] += promoted
@@ -14,10 +14,13 @@ token-level analysis (standalone script) and resolution tracking.
 
 import sqlite3
 import json
+import csv
 import os
+import queue
+import re
 import time
 import threading
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Optional
 from collections import defaultdict
@@ -29,6 +32,149 @@ try:
 except ImportError:
     HAS_REQUESTS = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Bumped whenever _migrate_schema gains a step (stored in PRAGMA user_version)
+SCHEMA_VERSION = 2
+
+# Connection tuning. Sized for a single small instance: the whole working
+# set (tiers, incremental stats, token cache) fits in the page cache / mmap.
+CACHE_SIZE_KIB = 64 * 1024           # PRAGMA cache_size (negative = KiB)
+MMAP_SIZE_BYTES = 256 * 1024 * 1024  # PRAGMA mmap_size
+BUSY_TIMEOUT_MS = 5000               # wait on a competing writer instead of failing
+READ_POOL_SIZE = 4                   # query_only reader connections (WAL reads run concurrently)
+FRESH_DB_PAGE_SIZE = 8192            # only takes effect before the first table exists
+
+# Minimum spacing between periodic maintenance runs (planner statistics
+# refresh + incremental vacuum)
+MAINTENANCE_INTERVAL_SECONDS = 15 * 60
+
+# Hot-path point reads. Kept as constants so every call site passes the same
+# SQL text and hits the connection's prepared-statement cache
+# (cached_statements) instead of re-parsing.
+_SQL_GET_METADATA = "SELECT value FROM scan_metadata WHERE key = ?"
+_SQL_GET_CACHED_TIMEFRAME = "SELECT timeframe FROM token_timeframes WHERE token_id = ?"
+_SQL_GET_CACHED_MARKET_INFO = "SELECT timeframe, question FROM token_timeframes WHERE token_id = ?"
+_SQL_IS_WHALE_IN_TIER = "SELECT 1 FROM whale_timeframe_stats WHERE address = ? LIMIT 1"
+
+# Hot-path writes (one cached prepared statement each; see cached_statements)
+_SQL_SET_METADATA = "INSERT OR REPLACE INTO scan_metadata (key, value) VALUES (?, ?)"
+
+# Params: (address, timeframe, pnl, volume); win/loss is the sign of pnl.
+_SQL_UPSERT_INCREMENTAL_STATS = """
+    INSERT INTO whale_incremental_stats (address, timeframe, trades, wins, losses, net_pnl, volume, last_updated)
+    VALUES (?1, ?2, 1, ?3 > 0, ?3 < 0, ?3, ?4, CURRENT_TIMESTAMP)
+    ON CONFLICT(address, timeframe) DO UPDATE SET
+        trades = trades + 1,
+        wins = wins + excluded.wins,
+        losses = losses + excluded.losses,
+        net_pnl = net_pnl + excluded.net_pnl,
+        volume = volume + excluded.volume,
+        last_updated = CURRENT_TIMESTAMP
+"""
+
+_SQL_INSERT_PENDING_TRADE = """
+    INSERT INTO whale_pending_trades
+    (token_id, whale_address, is_maker, maker_amount, taker_amount, token_side, timeframe, expected_resolution)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_DELETE_PENDING_TRADE = "DELETE FROM whale_pending_trades WHERE id = ?"
+
+_SQL_UPSERT_TOKEN_TIMEFRAME = """
+    INSERT INTO token_timeframes (token_id, timeframe, question, resolved, outcome, token_side, whale_net)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(token_id) DO UPDATE SET
+        timeframe = COALESCE(excluded.timeframe, timeframe),
+        question = COALESCE(excluded.question, question),
+        resolved = COALESCE(excluded.resolved, resolved),
+        outcome = COALESCE(excluded.outcome, outcome),
+        token_side = COALESCE(excluded.token_side, token_side),
+        whale_net = COALESCE(excluded.whale_net, whale_net),
+        resolved_at = CASE WHEN excluded.resolved = 1 THEN CURRENT_TIMESTAMP ELSE resolved_at END
+"""
+
+# token_timeframes CSV load (shared by the full-batch and trailing-batch inserts).
+# Overwrites every CSV column like INSERT OR REPLACE did, but rows whose
+# values are unchanged are skipped entirely (no page write, no WAL frame).
+_SQL_INSERT_TOKEN_TIMEFRAME = """
+    INSERT INTO token_timeframes
+    (token_id, timeframe, question, resolved, outcome, token_side, whale_net)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(token_id) DO UPDATE SET
+        timeframe = excluded.timeframe,
+        question = excluded.question,
+        resolved = excluded.resolved,
+        outcome = excluded.outcome,
+        token_side = excluded.token_side,
+        whale_net = excluded.whale_net,
+        resolved_at = CASE WHEN excluded.resolved = 1 THEN resolved_at END
+    WHERE timeframe IS NOT excluded.timeframe
+       OR question IS NOT excluded.question
+       OR resolved IS NOT excluded.resolved
+       OR outcome IS NOT excluded.outcome
+       OR token_side IS NOT excluded.token_side
+       OR whale_net IS NOT excluded.whale_net
+"""
+
+# Tier promotion / CSV load. Upsert rather than INSERT OR REPLACE: REPLACE
+# deletes and re-inserts the row (and its index entries) even when the
+# whale is already present. Rows whose stats are unchanged are not rewritten
+# (updated_at is the time of the last actual change).
+_SQL_UPSERT_TIER_WHALE = """
+    INSERT INTO whale_timeframe_stats
+    (address, timeframe, trade_count, wins, losses, volume, profit, win_rate, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(address, timeframe) DO UPDATE SET
+        trade_count = excluded.trade_count,
+        wins = excluded.wins,
+        losses = excluded.losses,
+        volume = excluded.volume,
+        profit = excluded.profit,
+        win_rate = excluded.win_rate,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE trade_count IS NOT excluded.trade_count
+       OR wins IS NOT excluded.wins
+       OR losses IS NOT excluded.losses
+       OR volume IS NOT excluded.volume
+       OR profit IS NOT excluded.profit
+       OR win_rate IS NOT excluded.win_rate
+"""
+
+# dry_run_positions.extra_data codec: orjson (C) when installed, else stdlib json.
+# Anything orjson rejects in this mode (non-str keys, >64-bit ints, numpy and
+# other float/int/str subclasses, datetimes) is encoded by json.dumps instead,
+# so the same values are accepted either way. The stored text still differs:
+# orjson writes compact separators, non-ASCII as raw UTF-8 rather than \u
+# escapes, and NaN/Infinity as null (read back as None); it also accepts
+# UUIDs/Enums. Both decoders read either form.
+if HAS_ORJSON:
+    _ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME |
+                       orjson.OPT_PASSTHROUGH_DATACLASS |
+                       orjson.OPT_PASSTHROUGH_SUBCLASS)
+
+    def _dumps(obj) -> str:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode()
+        except orjson.JSONEncodeError:
+            return json.dumps(obj)
+
+    def _loads(text: str):
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            return json.loads(text)  # rows written by stdlib json (e.g. NaN)
+else:
+    _dumps = json.dumps
+    _loads = json.loads
+
+# One "0xADDR:+123.45" entry of a whale_net string ("...|...")
+_WHALE_NET_ENTRY = re.compile(r'(0x[0-9a-fA-F]+):([+-]?\d+(?:\.\d+)?)')
+
 
 def get_db_path() -> str:
     """Get database path from environment or use default"""
@@ -44,10 +190,16 @@ class TradeDatabase:
     - Token resolution cache
     """
 
-    def __init__(self, db_path: str = "trades.db"):
+    def __init__(self, db_path: str = "trades.db", synchronous: str = "NORMAL"):
         self.db_path = db_path
+        self.synchronous = synchronous  # PRAGMA synchronous; OFF only for throwaway databases
         self.conn = None
-        self._lock = threading.Lock()  # Thread-safe access
+        self._read_pool: Optional[queue.Queue] = None  # query_only connections for reporting reads
+        self._lock = threading.RLock()  # Thread-safe access (re-entered by transaction())
+        self._tx_depth = 0  # >0 while inside transaction(); writers defer their commit
+        self._metadata_cache: Dict[str, Optional[str]] = {}  # scan_metadata read-through
+        self._tier_whales: Optional[set] = None  # get_all_tier_whales cache (None = reload)
+        self._last_maintenance = time.monotonic()
         self._init_database()
 
     def _init_database(self):
@@ -58,12 +210,39 @@ class TradeDatabase:
             os.makedirs(db_dir, exist_ok=True)
             print(f"📁 Created database directory: {db_dir}")
 
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
+        # Larger statement cache so the per-token/per-trade point queries
+        # never fall out of it and get re-prepared. isolation_level=None:
+        # no implicit BEGIN - single statements autocommit and transaction()
+        # is the only place a transaction is opened. No row_factory: every
+        # reader indexes rows by position, and plain tuples skip building a
+        # sqlite3.Row per row.
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                    isolation_level=None, cached_statements=256)
+        # First, so everything below waits out another process's lock
+        self.conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+
+        # Incremental auto-vacuum lets prunes hand pages back without a full VACUUM.
+        # It (and page_size) can only be set before the first table exists (fresh file).
+        # Existing files are left as they are: converting one means a full VACUUM,
+        # which is an explicit maintenance step (enable_incremental_auto_vacuum).
+        if self.conn.execute("PRAGMA page_count").fetchone()[0] == 0:
+            self.conn.execute(f"PRAGMA page_size={FRESH_DB_PAGE_SIZE}")
+            self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        elif self.conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            print("   Incremental auto-vacuum is off for this database "
+                  "(run enable_incremental_auto_vacuum() during maintenance to convert)")
 
         # Enable WAL mode for better concurrent access
         self.conn.execute("PRAGMA journal_mode=WAL")
-        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(f"PRAGMA synchronous={self.synchronous}")
+
+        # Keep hot pages in memory; sorts/temp B-trees never spill to disk
+        self.conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB}")
+        self.conn.execute(f"PRAGMA mmap_size={MMAP_SIZE_BYTES}")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+
+        # Upgrade tables left by older versions before (re)creating indexes
+        self._migrate_schema()
 
         # Create metadata table for tracking state
         self.conn.execute("""
@@ -109,9 +288,10 @@ class TradeDatabase:
                 win_rate REAL DEFAULT 0,
                 updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
                 PRIMARY KEY (address, timeframe)
-            )
+            ) WITHOUT ROWID
         """)
         self.conn.execute("CREATE INDEX IF NOT EXISTS idx_whale_stats_timeframe ON whale_timeframe_stats(timeframe)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_whale_stats_tf_profit ON whale_timeframe_stats(timeframe, profit DESC)")
 
         # =======================================================================
         # WHALE_INCREMENTAL_STATS: Running totals from live resolution
@@ -128,8 +308,13 @@ class TradeDatabase:
                 volume REAL DEFAULT 0,
                 last_updated TEXT DEFAULT CURRENT_TIMESTAMP,
                 PRIMARY KEY (address, timeframe)
-            )
+            ) WITHOUT ROWID
         """)
+        # Top/worst-N by net_pnl walk this index and stop at LIMIT instead of
+        # sorting; trades and wins are in the key so the min-trades and
+        # win-rate filters are checked on the index entry before the row is
+        # fetched
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_incremental_net_pnl ON whale_incremental_stats(net_pnl, trades, wins)")
 
         # =======================================================================
         # WHALE_PENDING_TRADES: Trades awaiting resolution
@@ -148,7 +333,14 @@ class TradeDatabase:
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP
             )
         """)
-        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pending_resolution ON whale_pending_trades(expected_resolution)")
+        # Due-trade polling seeks on expected_resolution; token_id and
+        # whale_address ride along so get_pending_trades_summary is answered
+        # from this index without reading the wider table rows.
+        # Timestamps here and in dry_run_positions are ISO-8601 text, which
+        # sorts lexically: compare the bare column against an isoformat()
+        # parameter - wrapping it in datetime()/strftime() defeats the index.
+        self.conn.execute("DROP INDEX IF EXISTS idx_pending_resolution")  # superseded
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pending_due ON whale_pending_trades(expected_resolution, token_id, whale_address)")
         self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pending_token ON whale_pending_trades(token_id)")
 
         # =======================================================================
@@ -176,53 +368,264 @@ class TradeDatabase:
                 extra_data TEXT
             )
         """)
-        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_dryrun_status ON dry_run_positions(status)")
+        self.conn.execute("DROP INDEX IF EXISTS idx_dryrun_status")  # superseded
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_dryrun_status_opened ON dry_run_positions(status, opened_at)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_dryrun_status_resolved ON dry_run_positions(status, resolved_at)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_dryrun_status_pnl ON dry_run_positions(status, pnl)")
         self.conn.execute("CREATE INDEX IF NOT EXISTS idx_dryrun_token ON dry_run_positions(token_id)")
 
-        self.conn.commit()
+        self._read_pool = queue.Queue()
+        if self.db_path == ':memory:':
+            self._read_pool.put(self.conn)  # a second connection would be a different database
+        else:
+            for _ in range(READ_POOL_SIZE):
+                self._read_pool.put(self._open_read_connection())
         print(f"Trade database initialized: {self.db_path}")
 
+    def _open_read_connection(self) -> sqlite3.Connection:
+        """
+        Reader connection for analytics/reporting queries (one per pool slot).
+
+        Under WAL each reads its own committed snapshot, so long reports neither
+        wait for nor hold up the writer connection, and pooled readers run
+        concurrently with each other. query_only guards against a write
+        slipping onto one.
+        """
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               isolation_level=None, cached_statements=256)
+        conn.execute("PRAGMA query_only=ON")
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE_BYTES}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        return conn
+
+    @contextmanager
+    def read_connection(self):
+        """
+        Check out a pooled reader connection (blocks while all are in use).
+
+        Usage:
+            with db.read_connection() as conn:
+                rows = conn.execute(...).fetchall()
+        """
+        conn = self._read_pool.get()
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
+
+    def _read_all(self, sql: str, params: tuple = ()) -> list:
+        """Run a reporting query on a pooled reader and return every row"""
+        with self.read_connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def _read_one(self, sql: str, params: tuple = ()) -> Optional[tuple]:
+        """Run a reporting query on a pooled reader and return its first row"""
+        with self.read_connection() as conn:
+            return conn.execute(sql, params).fetchone()
+
+    def _migrate_schema(self):
+        """
+        Upgrade an existing database to SCHEMA_VERSION.
+
+        Runs before the CREATE statements in _init_database, so steps that
+        rebuild a table get their indexes recreated right after.
+        """
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+
+        with self.transaction():
+            if version < 1:
+                # v1: pure key -> stats tables stored as a single B-tree on their PK
+                for table in ('whale_timeframe_stats', 'whale_incremental_stats'):
+                    self._rebuild_without_rowid(table)
+
+            if version < 2:
+                # v2: addresses stored lowercase so reads can skip normalisation
+                self._lowercase_addresses('whale_timeframe_stats', 'address')
+                self._lowercase_addresses('whale_incremental_stats', 'address',
+                                          counters=('trades', 'wins', 'losses', 'net_pnl', 'volume'))
+                self._lowercase_addresses('whale_pending_trades', 'whale_address')
+
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _rebuild_without_rowid(self, table: str):
+        """Copy a rowid table into a WITHOUT ROWID table with the same columns"""
+        row = self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (table,)
+        ).fetchone()
+        if row is None or 'WITHOUT ROWID' in row[0].upper():
+            return
+
+        self.conn.execute(row[0].replace(table, f"{table}_new", 1) + " WITHOUT ROWID")
+        self.conn.execute(f"INSERT INTO {table}_new SELECT * FROM {table}")
+        self.conn.execute(f"DROP TABLE {table}")
+        self.conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+        print(f"   Migrated {table} to WITHOUT ROWID")
+
+    def _lowercase_addresses(self, table: str, column: str, counters: tuple = ()):
+        """
+        Rewrite mixed-case addresses in place.
+
+        For (address, timeframe)-keyed running totals pass their columns as
+        counters: every case variant is summed into the lowercase row. Otherwise
+        the lowercase row wins on PK clashes.
+        """
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (table,)
+        ).fetchone()
+        if exists is None:
+            return
+
+        if counters:
+            sums = ", ".join(f"SUM({c})" for c in counters)
+            merge = ", ".join(f"{c} = {c} + excluded.{c}" for c in counters)
+            cursor = self.conn.execute(f"""
+                INSERT INTO {table} ({column}, timeframe, {", ".join(counters)}, last_updated)
+                SELECT LOWER({column}), timeframe, {sums}, MAX(last_updated)
+                FROM {table}
+                WHERE {column} != LOWER({column})
+                GROUP BY LOWER({column}), timeframe
+                ON CONFLICT({column}, timeframe) DO UPDATE SET
+                    {merge},
+                    last_updated = MAX(last_updated, excluded.last_updated)
+            """)
+            self.conn.execute(f"DELETE FROM {table} WHERE {column} != LOWER({column})")
+            if cursor.rowcount > 0:
+                print(f"   Lowercased {cursor.rowcount} addresses in {table} (counters merged)")
+            return
+
+        cursor = self.conn.execute(f"""
+            UPDATE OR IGNORE {table} SET {column} = LOWER({column})
+            WHERE {column} != LOWER({column})
+        """)
+        # Rows left behind collided with an existing lowercase row
+        self.conn.execute(f"DELETE FROM {table} WHERE {column} != LOWER({column})")
+        if cursor.rowcount > 0:
+            print(f"   Lowercased {cursor.rowcount} addresses in {table}")
+
     @contextmanager
     def transaction(self):
         """
         Context manager for transaction isolation.
         Uses BEGIN IMMEDIATE to prevent concurrent writes.
 
+        Outside a block every write statement autocommits. Writer methods
+        called inside the block join it, so a burst of writes costs a single
+        commit. Nested blocks join the outermost one. Enter and use it from
+        one thread.
+
         Usage:
             with db.transaction():
-                db.conn.execute(...)
-                db.conn.execute(...)
+                db.update_token_resolution(...)
+                db.delete_pending_trade(...)
             # Auto-commits on success, rollbacks on error
         """
         with self._lock:
+            if self._tx_depth:
+                self._tx_depth += 1
+                try:
+                    yield
+                finally:
+                    self._tx_depth -= 1
+                return
+
             try:
                 self.conn.execute("BEGIN IMMEDIATE")
+                self._tx_depth = 1
                 yield
                 self.conn.commit()
-            except Exception:
+            except BaseException:
+                # BaseException too: a KeyboardInterrupt mid-block must not leave
+                # BEGIN IMMEDIATE open (autocommit writes would then never land)
                 self.conn.rollback()
+                self._metadata_cache.clear()  # may hold rolled-back values
+                self._tier_whales = None
                 raise
+            finally:
+                self._tx_depth = 0
+
+        # Writers inside the block could not run it (the page reclaim needs
+        # autocommit), so give it its chance once the outermost block commits
+        self._maybe_run_maintenance()
+
+    def _reclaim_free_pages(self, max_pages: int = 1000):
+        """
+        Release up to max_pages freelist pages back to the filesystem.
+
+        Uses executescript because execute() only steps the pragma once
+        (one page per call); skipped inside transaction().
+        """
+        if self._tx_depth:
+            return  # executescript would commit the enclosing transaction
+        self.conn.executescript(f"PRAGMA incremental_vacuum({int(max_pages)})")
+
+    def enable_incremental_auto_vacuum(self) -> bool:
+        """
+        Convert an existing database to incremental auto-vacuum (opt-in maintenance).
+
+        Rewrites the whole file with VACUUM: needs up to 2x the database size in
+        free disk space and holds an exclusive lock until done, so run it while
+        nothing else has the database open.
+
+        Returns: True if the database was converted, False if it already was
+        """
+        with self._lock:
+            if self.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                return False
+            self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            self.conn.execute("VACUUM")
+        print("   Enabled incremental auto-vacuum (full VACUUM)")
+        return True
+
+    def _checkpoint_wal(self):
+        """Fold the WAL back into the main file and truncate it (after bulk loads)"""
+        if self._tx_depth:
+            return
+        with self._lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def _maybe_run_maintenance(self):
+        """
+        At most once per MAINTENANCE_INTERVAL_SECONDS: refresh planner stats
+        and hand back pages freed by resolved/deleted pending trades.
+
+        Deferred while a transaction() is open (transaction() calls this
+        again after its commit), so the interval is never spent on a no-op.
+        """
+        if self._tx_depth:
+            return
+        now = time.monotonic()
+        if now - self._last_maintenance < MAINTENANCE_INTERVAL_SECONDS:
+            return
+        self._last_maintenance = now
+        with self._lock:
+            self.conn.execute("PRAGMA optimize")
+            self._reclaim_free_pages()
 
     # =========================================================================
     # METADATA
     # =========================================================================
 
     def get_metadata(self, key: str) -> Optional[str]:
-        """Get a metadata value"""
-        cursor = self.conn.execute(
-            "SELECT value FROM scan_metadata WHERE key = ?", (key,)
-        )
+        """Get a metadata value (cached; this instance is the only writer)"""
+        if key in self._metadata_cache:
+            return self._metadata_cache[key]
+
+        cursor = self.conn.execute(_SQL_GET_METADATA, (key,))
         row = cursor.fetchone()
-        return row['value'] if row else None
+        value = row[0] if row else None
+        self._metadata_cache[key] = value
+        return value
 
     def set_metadata(self, key: str, value: str):
         """Set a metadata value"""
         with self._lock:
-            self.conn.execute("""
-                INSERT OR REPLACE INTO scan_metadata (key, value)
-                VALUES (?, ?)
-            """, (key, value))
-            self.conn.commit()
+            self.conn.execute(_SQL_SET_METADATA, (key, value))
+            self._metadata_cache[key] = value
 
     # =========================================================================
     # TOKEN_TIMEFRAMES: Master table for market tokens
@@ -230,19 +633,13 @@ class TradeDatabase:
 
     def get_cached_timeframe(self, token_id: str) -> Optional[str]:
         """Get cached timeframe for a token"""
-        cursor = self.conn.execute(
-            "SELECT timeframe FROM token_timeframes WHERE token_id = ?",
-            (token_id,)
-        )
+        cursor = self.conn.execute(_SQL_GET_CACHED_TIMEFRAME, (token_id,))
         row = cursor.fetchone()
         return row[0] if row else None
 
     def get_cached_market_info(self, token_id: str) -> Optional[Dict]:
         """Get cached market info (timeframe and question) for a token"""
-        cursor = self.conn.execute(
-            "SELECT timeframe, question FROM token_timeframes WHERE token_id = ?",
-            (token_id,)
-        )
+        cursor = self.conn.execute(_SQL_GET_CACHED_MARKET_INFO, (token_id,))
         row = cursor.fetchone()
         if row:
             return {'timeframe': row[0], 'question': row[1]}
@@ -272,19 +669,9 @@ class TradeDatabase:
                             token_side: str = None, whale_net: str = None):
         """Add or update a token in token_timeframes"""
         with self._lock:
-            self.conn.execute("""
-                INSERT INTO token_timeframes (token_id, timeframe, question, resolved, outcome, token_side, whale_net)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(token_id) DO UPDATE SET
-                    timeframe = COALESCE(excluded.timeframe, timeframe),
-                    question = COALESCE(excluded.question, question),
-                    resolved = COALESCE(excluded.resolved, resolved),
-                    outcome = COALESCE(excluded.outcome, outcome),
-                    token_side = COALESCE(excluded.token_side, token_side),
-                    whale_net = COALESCE(excluded.whale_net, whale_net),
-                    resolved_at = CASE WHEN excluded.resolved = 1 THEN CURRENT_TIMESTAMP ELSE resolved_at END
-            """, (token_id, timeframe, question, 1 if resolved else 0, outcome, token_side, whale_net))
-            self.conn.commit()
+            self.conn.execute(_SQL_UPSERT_TOKEN_TIMEFRAME, (
+                token_id, timeframe, question, 1 if resolved else 0, outcome, token_side, whale_net
+            ))
 
     def cache_token_timeframe(self, token_id: str, timeframe: str, question: str = ''):
         """Cache a token's timeframe (alias for add_token_timeframe)"""
@@ -300,31 +687,29 @@ class TradeDatabase:
                     resolved_at = CASE WHEN ? = 1 THEN CURRENT_TIMESTAMP ELSE resolved_at END
                 WHERE token_id = ?
             """, (1 if resolved else 0, outcome, token_side, whale_net, 1 if resolved else 0, token_id))
-            self.conn.commit()
 
     def get_token_timeframes_stats(self) -> dict:
         """Get stats about token_timeframes table"""
+        # Both counts are answered from the timeframe / resolved indexes alone
         cursor = self.conn.execute("""
-            SELECT
-                COUNT(*) as total,
-                SUM(CASE WHEN timeframe = 'unknown' THEN 1 ELSE 0 END) as unknown,
-                SUM(CASE WHEN timeframe = '15min' THEN 1 ELSE 0 END) as min15,
-                SUM(CASE WHEN timeframe = 'hourly' THEN 1 ELSE 0 END) as hourly,
-                SUM(CASE WHEN timeframe = '4hour' THEN 1 ELSE 0 END) as hour4,
-                SUM(CASE WHEN timeframe = 'daily' THEN 1 ELSE 0 END) as daily,
-                SUM(CASE WHEN resolved = 1 THEN 1 ELSE 0 END) as resolved_count
-            FROM token_timeframes
+            SELECT timeframe, COUNT(*) FROM token_timeframes GROUP BY timeframe
         """)
-        row = cursor.fetchone()
+        counts = {row[0]: row[1] for row in cursor}
+
+        cursor = self.conn.execute("SELECT COUNT(*) FROM token_timeframes WHERE resolved = 1")
+        resolved = cursor.fetchone()[0]
+
+        total = sum(counts.values())
+        unknown = counts.get('unknown', 0)
         return {
-            'total': row[0] or 0,
-            'unknown': row[1] or 0,
-            'known': (row[0] or 0) - (row[1] or 0),
-            '15min': row[2] or 0,
-            'hourly': row[3] or 0,
-            '4hour': row[4] or 0,
-            'daily': row[5] or 0,
-            'resolved': row[6] or 0
+            'total': total,
+            'unknown': unknown,
+            'known': total - unknown,
+            '15min': counts.get('15min', 0),
+            'hourly': counts.get('hourly', 0),
+            '4hour': counts.get('4hour', 0),
+            'daily': counts.get('daily', 0),
+            'resolved': resolved
         }
 
     def get_winning_whales_for_token(self, token_id: str, min_pnl: float = 500.0) -> list:
@@ -342,17 +727,12 @@ class TradeDatabase:
         if not row or not row[0]:
             return []
 
-        winners = []
-        whale_net = row[0].strip('[]')
-        for entry in whale_net.split('|'):
-            if ':' in entry:
-                addr, pnl_str = entry.split(':', 1)
-                try:
-                    pnl = float(pnl_str.replace('+', ''))
-                    if pnl >= min_pnl:
-                        winners.append({'address': addr.strip().lower(), 'pnl': pnl})
-                except ValueError:
-                    continue
+        entries = ((addr, float(pnl)) for addr, pnl in _WHALE_NET_ENTRY.findall(row[0]))
+        winners = [
+            {'address': addr.lower(), 'pnl': pnl}
+            for addr, pnl in entries
+            if pnl >= min_pnl
+        ]
 
         return sorted(winners, key=lambda x: x['pnl'], reverse=True)
 
@@ -364,38 +744,42 @@ class TradeDatabase:
         """Get cached timeframe tier assignments"""
         tiers = {'15min': [], 'hourly': [], '4hour': [], 'daily': []}
 
+        # Only the tier timeframes are read (index seeks on timeframe), so
+        # every row returned belongs to a bucket
         cursor = self.conn.execute("""
             SELECT address, timeframe, trade_count, wins, volume, profit, win_rate
             FROM whale_timeframe_stats
-            ORDER BY profit DESC
-        """)
-
-        for row in cursor:
-            tf = row[1]
-            if tf in tiers:
-                tiers[tf].append({
-                    'address': row[0],
-                    'specialty': tf,
-                    'trades': row[2],
-                    'wins': row[3],
-                    'win_rate': row[6],
-                    'volume': row[4],
-                    'profit': row[5]
-                })
+            WHERE timeframe IN (?, ?, ?, ?)
+            ORDER BY timeframe, profit DESC
+        """, tuple(tiers))
+
+        for address, tf, trades, wins, volume, profit, win_rate in cursor.fetchall():
+            tiers[tf].append({
+                'address': address,
+                'specialty': tf,
+                'trades': trades,
+                'wins': wins,
+                'win_rate': win_rate,
+                'volume': volume,
+                'profit': profit
+            })
 
         return tiers
 
     def get_all_tier_whales(self) -> set:
-        """Get set of all whale addresses in any tier"""
-        cursor = self.conn.execute("SELECT DISTINCT address FROM whale_timeframe_stats")
-        return {row[0].lower() for row in cursor}
+        """Get set of all whale addresses in any tier (cached until the tiers change)"""
+        with self._lock:
+            if self._tier_whales is None:
+                cursor = self.conn.execute("SELECT DISTINCT address FROM whale_timeframe_stats")
+                self._tier_whales = {row[0] for row in cursor}
+            return set(self._tier_whales)
 
     def is_whale_in_tier(self, address: str) -> bool:
         """Check if an address is in any tier"""
-        cursor = self.conn.execute(
-            "SELECT 1 FROM whale_timeframe_stats WHERE address = ? LIMIT 1",
-            (address.lower(),)
-        )
+        tier_whales = self._tier_whales
+        if tier_whales is not None:
+            return address.lower() in tier_whales
+        cursor = self.conn.execute(_SQL_IS_WHALE_IN_TIER, (address.lower(),))
         return cursor.fetchone() is not None
 
     def promote_whale_to_tier(self, address: str, timeframe: str, trades: int, wins: int,
@@ -404,26 +788,36 @@ class TradeDatabase:
         Add or update a whale in whale_timeframe_stats (tier promotion).
         """
         with self._lock:
-            self.conn.execute("""
-                INSERT INTO whale_timeframe_stats
-                (address, timeframe, trade_count, wins, losses, volume, profit, win_rate, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(address, timeframe) DO UPDATE SET
-                    trade_count = excluded.trade_count,
-                    wins = excluded.wins,
-                    losses = excluded.losses,
-                    volume = excluded.volume,
-                    profit = excluded.profit,
-                    win_rate = excluded.win_rate,
-                    updated_at = CURRENT_TIMESTAMP
-            """, (address.lower(), timeframe, trades, wins, losses, volume, profit, win_rate))
-            self.conn.commit()
+            self.conn.execute(_SQL_UPSERT_TIER_WHALE, (
+                address.lower(), timeframe, trades, wins, losses, volume, profit, win_rate
+            ))
+            if self._tier_whales is not None:
+                self._tier_whales.add(address.lower())
+
+    def promote_whales_to_tiers(self, whales: List[tuple]) -> int:
+        """
+        Bulk promote_whale_to_tier: one executemany in one transaction.
+
+        Args:
+            whales: [(address, timeframe, trades, wins, losses, volume, profit, win_rate), ...]
+
+        Returns: Number of whales submitted (like calling promote_whale_to_tier
+        for each; rows already holding identical stats are left unwritten)
+        """
+        with self.transaction():
+            self.conn.executemany(
+                _SQL_UPSERT_TIER_WHALE,
+                ((w[0].lower(),) + tuple(w[1:]) for w in whales)
+            )
+            self._tier_whales = None
+        return len(whales)
 
     def clear_timeframe_cache(self):
         """Clear cached tier assignments to force re-analysis"""
         with self._lock:
             self.conn.execute("DELETE FROM whale_timeframe_stats")
-            self.conn.commit()
+            self._tier_whales = None
+            self._reclaim_free_pages()
         print("   Cleared timeframe cache")
 
     # =========================================================================
@@ -435,22 +829,34 @@ class TradeDatabase:
         Incrementally update whale stats from a single trade.
         Called when a resolved trade is processed.
         """
-        is_win = 1 if pnl > 0 else 0
-        is_loss = 1 if pnl < 0 else 0
-
         with self._lock:
-            self.conn.execute("""
-                INSERT INTO whale_incremental_stats (address, timeframe, trades, wins, losses, net_pnl, volume, last_updated)
-                VALUES (?, ?, 1, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(address, timeframe) DO UPDATE SET
-                    trades = trades + 1,
-                    wins = wins + excluded.wins,
-                    losses = losses + excluded.losses,
-                    net_pnl = net_pnl + excluded.net_pnl,
-                    volume = volume + excluded.volume,
-                    last_updated = CURRENT_TIMESTAMP
-            """, (address.lower(), timeframe, is_win, is_loss, pnl, volume))
-            self.conn.commit()
+            self.conn.execute(_SQL_UPSERT_INCREMENTAL_STATS, (
+                address.lower(), timeframe, pnl, volume
+            ))
+
+        self._maybe_run_maintenance()
+
+    def update_whale_incremental_stats_bulk(self, trades: List[tuple]) -> int:
+        """
+        Bulk update_whale_incremental_stats: one executemany in one transaction.
+
+        Args:
+            trades: [(address, timeframe, pnl, volume), ...]
+
+        Returns: Number of trades applied
+        """
+        rows = [
+            (address.lower(), timeframe, pnl, volume)
+            for address, timeframe, pnl, volume in trades
+        ]
+        if not rows:
+            return 0
+
+        with self.transaction():
+            self.conn.executemany(_SQL_UPSERT_INCREMENTAL_STATS, rows)
+
+        self._maybe_run_maintenance()
+        return len(rows)
 
     def get_whale_incremental_stats(self, address: str) -> Dict[str, Dict]:
         """Get incremental stats for a whale across all timeframes"""
@@ -546,31 +952,36 @@ class TradeDatabase:
 
         Returns: Number of whales promoted
         """
-        top_performers = self.get_top_performers_from_observations(min_trades, min_win_rate, limit=50)
-
-        # Get existing tier whales to avoid duplicates
-        existing = self.get_all_tier_whales()
-
-        promoted = 0
-        for perf in top_performers:
-            addr = perf['address'].lower()
-
-            # Skip if already in tier
-            if addr in existing:
-                continue
-
-            # Promote to tier
-            self.promote_whale_to_tier(
-                address=addr,
-                timeframe=perf['timeframe'],
-                trades=perf['trades'],
-                wins=perf['wins'],
-                losses=perf['losses'],
-                volume=perf['volume'],
-                profit=perf['net_pnl'],
-                win_rate=perf['win_rate']
-            )
-            promoted += 1
+        # Same candidate set as get_top_performers_from_observations(limit=50),
+        # minus whales already in a tier, inserted in one statement
+        with self.transaction():
+            cursor = self.conn.execute("""
+                INSERT INTO whale_timeframe_stats
+                (address, timeframe, trade_count, wins, losses, volume, profit, win_rate, updated_at)
+                SELECT address, timeframe, trades, wins, losses, volume, net_pnl, win_rate, CURRENT_TIMESTAMP
+                FROM (
+                    SELECT
+                        address,
+                        timeframe,
+                        trades,
+                        wins,
+                        losses,
+                        COALESCE(net_pnl, 0) as net_pnl,
+                        COALESCE(volume, 0) as volume,
+                        CASE WHEN trades > 0 THEN CAST(wins AS REAL) / trades ELSE 0 END as win_rate
+                    FROM whale_incremental_stats
+                    WHERE trades >= ?
+                    AND CASE WHEN trades > 0 THEN CAST(wins AS REAL) / trades ELSE 0 END >= ?
+                    ORDER BY net_pnl DESC
+                    LIMIT 50
+                ) top
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM whale_timeframe_stats w WHERE w.address = top.address
+                )
+            """, (min_trades, min_win_rate))
+            promoted = cursor.rowcount
+            if promoted > 0:
+                self._tier_whales = None
 
         if promoted > 0:
             print(f"   🐋 Promoted {promoted} top performers from observations to active tier list")
@@ -587,28 +998,24 @@ class TradeDatabase:
 
         Returns: Number of whales pruned
         """
-        # Find underperforming whales
-        cursor = self.conn.execute("""
-            SELECT address, timeframe, win_rate, trade_count
-            FROM whale_timeframe_stats
-            WHERE trade_count >= ?
-            AND win_rate < ?
-        """, (min_trades, min_win_rate))
-
-        to_prune = cursor.fetchall()
+        # Remove underperforming whales in one statement; RETURNING hands back
+        # the deleted rows for the log lines below
+        with self.transaction():
+            cursor = self.conn.execute("""
+                DELETE FROM whale_timeframe_stats
+                WHERE trade_count >= ?
+                AND win_rate < ?
+                RETURNING address, timeframe, win_rate, trade_count
+            """, (min_trades, min_win_rate))
+            to_prune = cursor.fetchall()
+            if to_prune:
+                self._tier_whales = None
 
         if not to_prune:
             return 0
 
-        # Remove them from the tier
         with self._lock:
-            for row in to_prune:
-                address, timeframe = row[0], row[1]
-                self.conn.execute("""
-                    DELETE FROM whale_timeframe_stats
-                    WHERE address = ? AND timeframe = ?
-                """, (address.lower(), timeframe))
-            self.conn.commit()
+            self._reclaim_free_pages()
 
         if len(to_prune) > 0:
             print(f"   🧹 Pruned {len(to_prune)} whales with win rate below {min_win_rate*100:.0f}%")
@@ -619,14 +1026,19 @@ class TradeDatabase:
 
     def get_incremental_stats_summary(self) -> dict:
         """Get summary of incremental stats for logging"""
-        cursor = self.conn.execute("""
+        # GROUP BY the PK prefix streams in key order; COUNT(DISTINCT) would
+        # build a temp B-tree of every address
+        row = self._read_one("""
             SELECT
-                COUNT(DISTINCT address) as unique_addresses,
+                COUNT(*) as unique_addresses,
                 SUM(trades) as total_trades,
                 SUM(net_pnl) as total_pnl
-            FROM whale_incremental_stats
+            FROM (
+                SELECT SUM(trades) as trades, SUM(net_pnl) as net_pnl
+                FROM whale_incremental_stats
+                GROUP BY address
+            )
         """)
-        row = cursor.fetchone()
         return {
             'unique_addresses': row[0] or 0,
             'total_trades': row[1] or 0,
@@ -638,37 +1050,32 @@ class TradeDatabase:
         Get comprehensive analytics on whale observations (trades we watched but didn't copy).
         This shows "what we learned" from watching whale behavior.
         """
-        # Overall stats
-        cursor = self.conn.execute("""
-            SELECT
-                COUNT(DISTINCT address) as unique_whales,
-                SUM(trades) as total_trades,
-                SUM(wins) as total_wins,
-                SUM(losses) as total_losses,
-                SUM(net_pnl) as total_pnl,
-                SUM(volume) as total_volume
-            FROM whale_incremental_stats
-        """)
-        overall = cursor.fetchone()
-
-        # Performance by timeframe
-        cursor = self.conn.execute("""
+        # Performance by timeframe and the overall totals in one scan: rows
+        # are read in primary-key order, so the first row of each address
+        # flags a new whale (a timeframe group holds each address once)
+        rows = self._read_all("""
             SELECT
                 timeframe,
-                COUNT(DISTINCT address) as whale_count,
+                COUNT(*) as whale_count,
                 SUM(trades) as trades,
                 SUM(wins) as wins,
                 SUM(losses) as losses,
                 SUM(net_pnl) as net_pnl,
                 CASE WHEN SUM(trades) > 0
                     THEN CAST(SUM(wins) AS REAL) / SUM(trades) * 100
-                    ELSE 0 END as win_rate
-            FROM whale_incremental_stats
+                    ELSE 0 END as win_rate,
+                SUM(volume) as volume,
+                SUM(new_address) as new_addresses
+            FROM (
+                SELECT *, address IS NOT LAG(address) OVER (ORDER BY address) as new_address
+                FROM whale_incremental_stats
+            )
             GROUP BY timeframe
             ORDER BY net_pnl DESC
         """)
+
         by_timeframe = {}
-        for row in cursor:
+        for row in rows:
             by_timeframe[row[0]] = {
                 'whale_count': row[1],
                 'trades': row[2],
@@ -678,8 +1085,18 @@ class TradeDatabase:
                 'win_rate': round(row[6] or 0, 1)
             }
 
+        # Overall stats: (unique_whales, total_trades, total_wins, total_losses, total_pnl, total_volume)
+        overall = (
+            sum(row[8] for row in rows),
+            sum(row[2] or 0 for row in rows),
+            sum(row[3] or 0 for row in rows),
+            sum(row[4] or 0 for row in rows),
+            sum(row[5] or 0 for row in rows),
+            sum(row[7] or 0 for row in rows),
+        )
+
         # Top performing whales we could have copied
-        cursor = self.conn.execute("""
+        rows = self._read_all("""
             SELECT
                 address,
                 timeframe,
@@ -694,7 +1111,7 @@ class TradeDatabase:
             LIMIT 10
         """)
         top_performers = []
-        for row in cursor:
+        for row in rows:
             top_performers.append({
                 'address': row[0],
                 'timeframe': row[1],
@@ -706,7 +1123,7 @@ class TradeDatabase:
             })
 
         # Worst performers (whales to avoid)
-        cursor = self.conn.execute("""
+        rows = self._read_all("""
             SELECT
                 address,
                 timeframe,
@@ -721,7 +1138,7 @@ class TradeDatabase:
             LIMIT 10
         """)
         worst_performers = []
-        for row in cursor:
+        for row in rows:
             worst_performers.append({
                 'address': row[0],
                 'timeframe': row[1],
@@ -779,13 +1196,31 @@ class TradeDatabase:
             expected_resolution: ISO timestamp when market should resolve
         """
         with self._lock:
-            self.conn.execute("""
-                INSERT INTO whale_pending_trades
-                (token_id, whale_address, is_maker, maker_amount, taker_amount, token_side, timeframe, expected_resolution)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (token_id, whale_address.lower(), 1 if is_maker else 0,
-                  maker_amount, taker_amount, token_side, timeframe, expected_resolution))
-            self.conn.commit()
+            self.conn.execute(_SQL_INSERT_PENDING_TRADE, (
+                token_id, whale_address.lower(), 1 if is_maker else 0,
+                maker_amount, taker_amount, token_side, timeframe, expected_resolution
+            ))
+
+    def add_pending_whale_trades(self, trades: List[tuple]) -> int:
+        """
+        Bulk add_pending_whale_trade: one executemany in one transaction.
+
+        Args:
+            trades: [(token_id, whale_address, is_maker, maker_amount, taker_amount,
+                      token_side, timeframe, expected_resolution), ...]
+
+        Returns: Number of trades queued
+        """
+        rows = [
+            (t[0], t[1].lower(), 1 if t[2] else 0) + tuple(t[3:])
+            for t in trades
+        ]
+        if not rows:
+            return 0
+
+        with self.transaction():
+            self.conn.executemany(_SQL_INSERT_PENDING_TRADE, rows)
+        return len(rows)
 
     def get_pending_trades_to_resolve(self, current_time: str = None) -> list:
         """
@@ -795,11 +1230,10 @@ class TradeDatabase:
         Args:
             current_time: ISO format timestamp to compare against (defaults to now)
         """
-        from datetime import datetime
         if current_time is None:
             current_time = datetime.now().isoformat()
 
-        cursor = self.conn.execute("""
+        rows = self._read_all("""
             SELECT id, token_id, whale_address, is_maker, maker_amount, taker_amount,
                    token_side, timeframe, expected_resolution, created_at
             FROM whale_pending_trades
@@ -808,7 +1242,7 @@ class TradeDatabase:
             LIMIT 100
         """, (current_time,))
         trades = []
-        for row in cursor:
+        for row in rows:
             trades.append({
                 'id': row[0],
                 'token_id': row[1],
@@ -825,14 +1259,14 @@ class TradeDatabase:
 
     def get_pending_trades_by_token(self, token_id: str) -> list:
         """Get all pending trades for a specific token."""
-        cursor = self.conn.execute("""
+        rows = self._read_all("""
             SELECT id, token_id, whale_address, is_maker, maker_amount, taker_amount,
                    token_side, timeframe, expected_resolution, created_at
             FROM whale_pending_trades
             WHERE token_id = ?
         """, (token_id,))
         trades = []
-        for row in cursor:
+        for row in rows:
             trades.append({
                 'id': row[0],
                 'token_id': row[1],
@@ -850,14 +1284,27 @@ class TradeDatabase:
     def delete_pending_trade(self, trade_id: int):
         """Delete a pending trade after it's been resolved."""
         with self._lock:
-            self.conn.execute("DELETE FROM whale_pending_trades WHERE id = ?", (trade_id,))
-            self.conn.commit()
+            self.conn.execute(_SQL_DELETE_PENDING_TRADE, (trade_id,))
+
+    def delete_pending_trades(self, trade_ids: List[int]) -> int:
+        """
+        Bulk delete_pending_trade: one executemany in one transaction.
+
+        Returns: Number of trades deleted
+        """
+        if not trade_ids:
+            return 0
+
+        with self.transaction():
+            cursor = self.conn.executemany(
+                _SQL_DELETE_PENDING_TRADE, ((trade_id,) for trade_id in trade_ids)
+            )
+        return cursor.rowcount
 
     def delete_pending_trades_by_token(self, token_id: str):
         """Delete all pending trades for a token after resolution."""
         with self._lock:
             self.conn.execute("DELETE FROM whale_pending_trades WHERE token_id = ?", (token_id,))
-            self.conn.commit()
 
     def get_pending_trades_count(self) -> int:
         """Get count of pending trades waiting for resolution."""
@@ -871,11 +1318,10 @@ class TradeDatabase:
         Args:
             current_time: ISO format timestamp to compare against (defaults to now)
         """
-        from datetime import datetime
         if current_time is None:
             current_time = datetime.now().isoformat()
 
-        cursor = self.conn.execute("""
+        row = self._read_one("""
             SELECT
                 COUNT(*) as total,
                 COUNT(DISTINCT token_id) as unique_tokens,
@@ -883,7 +1329,6 @@ class TradeDatabase:
                 SUM(CASE WHEN expected_resolution <= ? THEN 1 ELSE 0 END) as ready_to_resolve
             FROM whale_pending_trades
         """, (current_time,))
-        row = cursor.fetchone()
         return {
             'total': row[0] or 0,
             'unique_tokens': row[1] or 0,
@@ -897,7 +1342,6 @@ class TradeDatabase:
 
     def save_dry_run_position(self, position: dict):
         """Save a dry run position to the database."""
-        import json
         with self._lock:
             self.conn.execute("""
                 INSERT OR REPLACE INTO dry_run_positions (
@@ -923,9 +1367,8 @@ class TradeDatabase:
                 position.get('market_outcome'),
                 1 if position.get('is_win') else 0 if position.get('is_win') is False else None,
                 position.get('pnl'),
-                json.dumps(position.get('extra_data', {})) if position.get('extra_data') else None
+                _dumps(position.get('extra_data', {})) if position.get('extra_data') else None
             ))
-            self.conn.commit()
 
     def has_pending_position_for_token(self, token_id: str) -> bool:
         """Check if we already have a pending position for this token (duplicate prevention)."""
@@ -938,8 +1381,7 @@ class TradeDatabase:
 
     def get_pending_dry_run_positions(self) -> list:
         """Get all pending (unresolved) dry run positions."""
-        import json
-        cursor = self.conn.execute("""
+        rows = self._read_all("""
             SELECT id, token_id, whale_address, side, position_size, confidence,
                    market_timeframe, market_question, entry_price, opened_at,
                    expected_resolution, status, extra_data
@@ -948,7 +1390,7 @@ class TradeDatabase:
             ORDER BY opened_at ASC
         """)
         positions = []
-        for row in cursor:
+        for row in rows:
             pos = {
                 'id': row[0],
                 'token_id': row[1],
@@ -965,7 +1407,7 @@ class TradeDatabase:
             }
             if row[12]:
                 try:
-                    pos['extra_data'] = json.loads(row[12])
+                    pos['extra_data'] = _loads(row[12])
                 except:
                     pass
             positions.append(pos)
@@ -973,7 +1415,6 @@ class TradeDatabase:
 
     def resolve_dry_run_position(self, position_id: str, market_outcome: str, pnl: float, is_win: bool):
         """Mark a dry run position as resolved."""
-        from datetime import datetime
         with self._lock:
             self.conn.execute("""
                 UPDATE dry_run_positions SET
@@ -990,11 +1431,10 @@ class TradeDatabase:
                 pnl,
                 position_id
             ))
-            self.conn.commit()
 
     def get_dry_run_summary(self) -> dict:
         """Get summary statistics for dry run positions."""
-        cursor = self.conn.execute("""
+        row = self._read_one("""
             SELECT
                 COUNT(*) as total,
                 SUM(CASE WHEN status = 'PENDING' THEN 1 ELSE 0 END) as pending,
@@ -1005,7 +1445,6 @@ class TradeDatabase:
                 SUM(CASE WHEN status = 'RESOLVED' THEN pnl ELSE 0 END) as realized_pnl
             FROM dry_run_positions
         """)
-        row = cursor.fetchone()
         return {
             'total': row[0] or 0,
             'pending': row[1] or 0,
@@ -1017,23 +1456,32 @@ class TradeDatabase:
             'win_rate': (row[3] / row[2] * 100) if row[2] and row[2] > 0 else 0.0
         }
 
+    def get_dry_run_extrema(self) -> dict:
+        """
+        Best and worst PnL over all resolved dry run positions, in one round trip.
+
+        Each bound is its own MIN/MAX subquery so both stay single seeks on
+        idx_dryrun_status_pnl (a combined MIN(pnl), MAX(pnl) scans the range).
+        """
+        row = self._read_one("""
+            SELECT
+                (SELECT MAX(pnl) FROM dry_run_positions
+                 WHERE status = 'RESOLVED' AND pnl IS NOT NULL),
+                (SELECT MIN(pnl) FROM dry_run_positions
+                 WHERE status = 'RESOLVED' AND pnl IS NOT NULL)
+        """)
+        return {
+            'best': row[0] if row[0] is not None else 0.0,
+            'worst': row[1] if row[1] is not None else 0.0
+        }
+
     def get_best_trade_pnl(self) -> float:
         """Get the maximum PnL from all resolved dry run positions (all-time best)."""
-        cursor = self.conn.execute("""
-            SELECT MAX(pnl) FROM dry_run_positions
-            WHERE status = 'RESOLVED' AND pnl IS NOT NULL
-        """)
-        row = cursor.fetchone()
-        return row[0] if row[0] is not None else 0.0
+        return self.get_dry_run_extrema()['best']
 
     def get_worst_trade_pnl(self) -> float:
         """Get the minimum PnL from all resolved dry run positions (all-time worst)."""
-        cursor = self.conn.execute("""
-            SELECT MIN(pnl) FROM dry_run_positions
-            WHERE status = 'RESOLVED' AND pnl IS NOT NULL
-        """)
-        row = cursor.fetchone()
-        return row[0] if row[0] is not None else 0.0
+        return self.get_dry_run_extrema()['worst']
 
     def get_24h_committed_capital(self) -> dict:
         """
@@ -1045,12 +1493,11 @@ class TradeDatabase:
         Returns:
             Dict with committed capital stats for last 24 hours
         """
-        from datetime import datetime, timedelta
 
         # Calculate 24 hours ago
         cutoff = (datetime.now() - timedelta(hours=24)).isoformat()
 
-        cursor = self.conn.execute("""
+        row = self._read_one("""
             SELECT
                 COUNT(*) as positions_24h,
                 SUM(position_size) as total_committed_24h,
@@ -1062,7 +1509,6 @@ class TradeDatabase:
             FROM dry_run_positions
             WHERE opened_at >= ?
         """, (cutoff,))
-        row = cursor.fetchone()
 
         positions_24h = row[0] or 0
         total_committed = row[1] or 0.0
@@ -1082,10 +1528,14 @@ class TradeDatabase:
             'win_rate_24h': (wins_24h / resolved_count * 100) if resolved_count > 0 else 0.0
         }
 
-    def get_resolved_dry_run_positions(self) -> list:
-        """Get all resolved dry run positions for analytics."""
-        import json
-        cursor = self.conn.execute("""
+    def get_resolved_dry_run_positions(self, limit: int = None) -> list:
+        """
+        Get resolved dry run positions for analytics, most recently resolved first.
+
+        Args:
+            limit: Maximum number of positions to return (None = all)
+        """
+        rows = self._read_all("""
             SELECT id, token_id, whale_address, side, position_size, confidence,
                    market_timeframe, market_question, entry_price, opened_at,
                    expected_resolution, status, resolved_at, market_outcome,
@@ -1093,9 +1543,10 @@ class TradeDatabase:
             FROM dry_run_positions
             WHERE status = 'RESOLVED'
             ORDER BY resolved_at DESC
-        """)
+            LIMIT ?
+        """, (-1 if limit is None else limit,))
         positions = []
-        for row in cursor:
+        for row in rows:
             pos = {
                 'id': row[0],
                 'token_id': row[1],
@@ -1116,7 +1567,7 @@ class TradeDatabase:
             }
             if row[16]:
                 try:
-                    pos['extra_data'] = json.loads(row[16])
+                    pos['extra_data'] = _loads(row[16])
                 except:
                     pass
             positions.append(pos)
@@ -1138,13 +1589,11 @@ class TradeDatabase:
         Returns:
             Number of tokens loaded
         """
-        import csv
 
         tokens_loaded = 0
-        batch = []
 
-        with open(filepath, 'r') as f:
-            reader = csv.DictReader(f)
+        def token_rows(reader):
+            nonlocal tokens_loaded
             for row in reader:
                 token_id = row.get('token_id', row.get('token', ''))
                 if not token_id:
@@ -1157,32 +1606,17 @@ class TradeDatabase:
                 token_side = row.get('token_side', None)
                 whale_net = row.get('whale_net', row.get('whale_net_pnl_by_address', ''))
 
-                batch.append((
+                tokens_loaded += 1
+                yield (
                     token_id, timeframe, question,
                     1 if resolved else 0, outcome, token_side, whale_net
-                ))
-                tokens_loaded += 1
+                )
 
-                # Batch insert every 1000 records
-                if len(batch) >= 1000:
-                    with self._lock:
-                        self.conn.executemany("""
-                            INSERT OR REPLACE INTO token_timeframes
-                            (token_id, timeframe, question, resolved, outcome, token_side, whale_net)
-                            VALUES (?, ?, ?, ?, ?, ?, ?)
-                        """, batch)
-                        self.conn.commit()
-                    batch = []
-
-        # Insert remaining records
-        if batch:
-            with self._lock:
-                self.conn.executemany("""
-                    INSERT OR REPLACE INTO token_timeframes
-                    (token_id, timeframe, question, resolved, outcome, token_side, whale_net)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, batch)
-                self.conn.commit()
+        # Rows stream straight from the file into one executemany/transaction
+        with self.transaction(), open(filepath, 'r') as f:
+            self.conn.executemany(_SQL_INSERT_TOKEN_TIMEFRAME, token_rows(csv.DictReader(f)))
+
+        self._checkpoint_wal()
 
         stats = self.get_token_timeframes_stats()
         print(f"   Loaded {tokens_loaded} tokens ({stats['resolved']} resolved, {stats['known']} with known timeframe)")
@@ -1198,13 +1632,11 @@ class TradeDatabase:
         Returns:
             Number of whales loaded
         """
-        import csv
 
         whales_loaded = 0
-        batch = []
 
-        with open(filepath, 'r') as f:
-            reader = csv.DictReader(f)
+        def whale_rows(reader):
+            nonlocal whales_loaded
             for row in reader:
                 address = row.get('address', '')
                 if not address:
@@ -1223,32 +1655,18 @@ class TradeDatabase:
                 profit = float(row.get('profit', 0) or 0)
                 win_rate = float(row.get('win_rate', 0) or 0)
 
-                batch.append((
+                whales_loaded += 1
+                yield (
                     address.lower(), timeframe, trade_count, wins, losses,
                     volume, profit, win_rate
-                ))
-                whales_loaded += 1
+                )
 
-                # Batch insert every 500 records
-                if len(batch) >= 500:
-                    with self._lock:
-                        self.conn.executemany("""
-                            INSERT OR REPLACE INTO whale_timeframe_stats
-                            (address, timeframe, trade_count, wins, losses, volume, profit, win_rate, updated_at)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                        """, batch)
-                        self.conn.commit()
-                    batch = []
-
-        # Insert remaining records
-        if batch:
-            with self._lock:
-                self.conn.executemany("""
-                    INSERT OR REPLACE INTO whale_timeframe_stats
-                    (address, timeframe, trade_count, wins, losses, volume, profit, win_rate, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """, batch)
-                self.conn.commit()
+        # Rows stream straight from the file into one executemany/transaction
+        with self.transaction(), open(filepath, 'r') as f:
+            self.conn.executemany(_SQL_UPSERT_TIER_WHALE, whale_rows(csv.DictReader(f)))
+            self._tier_whales = None
+
+        self._checkpoint_wal()
 
         print(f"   Loaded {whales_loaded} tier whales from trader_tier_stats.csv")
         return whales_loaded
@@ -1265,13 +1683,11 @@ class TradeDatabase:
         Returns:
             Number of whales loaded
         """
-        import csv
 
         whales_loaded = 0
-        batch = []
 
-        with open(filepath, 'r') as f:
-            reader = csv.DictReader(f)
+        def whale_rows(reader):
+            nonlocal whales_loaded
             for row in reader:
                 address = row.get('address', '')
                 if not address:
@@ -1300,32 +1716,18 @@ class TradeDatabase:
                 win_rate = float(row.get('win_rate', 0) or 0)
                 tf_win_rate = float(row.get('tf_win_rate', 0) or 0) if row.get('tf_win_rate', '-') != '-' else win_rate
 
-                batch.append((
+                whales_loaded += 1
+                yield (
                     address.lower(), best_timeframe, num_tokens, win_tokens, loss_tokens,
                     0, total_pnl, tf_win_rate  # volume=0 (not in CSV), profit=total_pnl
-                ))
-                whales_loaded += 1
+                )
 
-                # Batch insert every 500 records
-                if len(batch) >= 500:
-                    with self._lock:
-                        self.conn.executemany("""
-                            INSERT OR REPLACE INTO whale_timeframe_stats
-                            (address, timeframe, trade_count, wins, losses, volume, profit, win_rate, updated_at)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                        """, batch)
-                        self.conn.commit()
-                    batch = []
-
-        # Insert remaining records
-        if batch:
-            with self._lock:
-                self.conn.executemany("""
-                    INSERT OR REPLACE INTO whale_timeframe_stats
-                    (address, timeframe, trade_count, wins, losses, volume, profit, win_rate, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """, batch)
-                self.conn.commit()
+        # Rows stream straight from the file into one executemany/transaction
+        with self.transaction(), open(filepath, 'r') as f:
+            self.conn.executemany(_SQL_UPSERT_TIER_WHALE, whale_rows(csv.DictReader(f)))
+            self._tier_whales = None
+
+        self._checkpoint_wal()
 
         print(f"   Loaded {whales_loaded} quality whales from whale_quality.csv")
         return whales_loaded
@@ -1337,62 +1739,77 @@ class TradeDatabase:
     def get_database_stats(self) -> Dict:
         """Get summary statistics about the database"""
         # Whale timeframe stats
-        cursor = self.conn.execute("""
-            SELECT COUNT(DISTINCT address) as whale_count
-            FROM whale_timeframe_stats
+        # (distinct counts are GROUP BYs over an index, which avoids a temp B-tree)
+        whale_count = self._read_one("""
+            SELECT COUNT(*) as whale_count
+            FROM (SELECT 1 FROM whale_timeframe_stats GROUP BY address)
+        """)[0] or 0
+
+        # Pending trades (only the counts reported here, not the full summary)
+        pending_total, pending_tokens = self._read_one("""
+            SELECT SUM(n), COUNT(*)
+            FROM (SELECT COUNT(*) as n FROM whale_pending_trades GROUP BY token_id)
         """)
-        whale_count = cursor.fetchone()[0] or 0
-
-        # Pending trades
-        pending = self.get_pending_trades_summary()
 
         # Incremental stats
         incremental = self.get_incremental_stats_summary()
 
-        # Token timeframes stats
-        token_stats = self.get_token_timeframes_stats()
+        # Token timeframes count (no need for the per-timeframe breakdown)
+        token_count = self._read_one("SELECT COUNT(*) FROM token_timeframes")[0] or 0
 
         return {
             'whale_count': whale_count,
-            'pending_trades': pending['total'],
-            'pending_tokens': pending['unique_tokens'],
+            'pending_trades': pending_total or 0,
+            'pending_tokens': pending_tokens or 0,
             'incremental_addresses': incremental['unique_addresses'],
             'incremental_trades': incremental['total_trades'],
-            'market_metadata': token_stats['total']
+            'market_metadata': token_count
         }
 
     def export_to_csv(self, filepath: str = "whale_specialists.csv"):
         """Export whale timeframe stats to CSV"""
-        import csv
-
-        cursor = self.conn.execute("""
-            SELECT address, timeframe, trade_count, wins, losses, volume, profit, win_rate
-            FROM whale_timeframe_stats
-            ORDER BY profit DESC
-        """)
-        rows = cursor.fetchall()
-
-        if not rows:
-            print("No whale data to export")
-            return
-
-        with open(filepath, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['address', 'timeframe', 'trade_count', 'wins', 'losses', 'volume', 'profit', 'win_rate'])
-            for row in rows:
-                writer.writerow(row)
 
-        print(f"Exported {len(rows)} whale records to {filepath}")
+        with self.read_connection() as conn:
+            cursor = conn.execute("""
+                SELECT address, timeframe, trade_count, wins, losses, volume, profit, win_rate
+                FROM whale_timeframe_stats
+                ORDER BY profit DESC
+            """)
+            first = cursor.fetchone()
+
+            if first is None:
+                print("No whale data to export")
+                return
+
+            # Stream the cursor straight into the writer so memory stays flat
+            exported = 1
+            with open(filepath, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow([col[0] for col in cursor.description])
+                writer.writerow(first)
+                while True:
+                    rows = cursor.fetchmany(1000)
+                    if not rows:
+                        break
+                    writer.writerows(rows)
+                    exported += len(rows)
+
+        print(f"Exported {exported} whale records to {filepath}")
 
     def close(self):
-        """Close database connection"""
+        """Close database connection (refreshing planner stats first)"""
+        while self._read_pool and not self._read_pool.empty():
+            conn = self._read_pool.get_nowait()
+            if conn is not self.conn:
+                conn.close()
         if self.conn:
+            self.conn.execute("PRAGMA optimize")
             self.conn.close()
 
 
 # Standalone test
 if __name__ == "__main__":
-    db = TradeDatabase("test_trades.db")
+    db = TradeDatabase("test_trades.db", synchronous="OFF")
 
     # Test pending trades
     db.add_pending_whale_trade(
@@ -72,7 +72,10 @@ class UltraFastDiscovery:
         while True:
             await asyncio.sleep(120)
 
-            stats = self.db.get_database_stats()
+            # Only query what the status line prints (get_database_stats would
+            # also re-count pending trades and token_timeframes)
+            whale_count = len(self.db.get_all_tier_whales())
+            incremental = self.db.get_incremental_stats_summary()
             pending = self.db.get_pending_trades_summary()
 
             # Check database file size
@@ -86,9 +89,9 @@ class UltraFastDiscovery:
             print("\n" + "-"*60)
             print(f"📊 STATS - {datetime.now().strftime('%H:%M:%S')}")
             print("-"*60)
-            print(f"🐋 Whales in tiers: {stats['whale_count']}")
+            print(f"🐋 Whales in tiers: {whale_count}")
             print(f"⏳ Pending trades: {pending['total']} ({pending['ready_to_resolve']} ready)")
-            print(f"📈 Incremental stats: {stats['incremental_addresses']} addresses, {stats['incremental_trades']} trades")
+            print(f"📈 Incremental stats: {incremental['unique_addresses']} addresses, {incremental['total_trades']} trades")
             print(f"🗄️  Database size: {db_size_str}")
             print("-"*60 + "\n")
 
@@ -22,12 +22,16 @@ Performance:
 import asyncio
 import json
 from datetime import datetime
+from operator import itemgetter
 from typing import Callable, List, Set, Optional
 from web3 import Web3
 from web3.middleware import ExtraDataToPOAMiddleware
 
 import config
 
+# Pulls the four OrderFilled fields we need from event['args'] in one C call
+_order_filled_args = itemgetter('maker', 'taker', 'makerAmountFilled', 'takerAmountFilled')
+
 
 class WebSocketTradeMonitor:
     """
@@ -327,27 +331,28 @@ class WebSocketTradeMonitor:
                     self.events_received += len(events)
 
                     for event in events:
-                        maker = event['args']['maker'].lower()
-                        taker = event['args']['taker'].lower()
+                        maker_raw, taker_raw, maker_amount, taker_amount = _order_filled_args(event['args'])
+                        maker = maker_raw.lower()
+                        taker = taker_raw.lower()
 
                         if maker in self.whale_addresses or taker in self.whale_addresses:
                             self.whale_trades_detected += 1
 
                             if maker in self.whale_addresses:
-                                whale = event['args']['maker']
+                                whale = maker_raw
                                 side = 'SELL'
                             else:
-                                whale = event['args']['taker']
+                                whale = taker_raw
                                 side = 'BUY'
 
                             trade_data = {
                                 'whale_address': whale,
                                 'side': side,
-                                'maker': event['args']['maker'],
-                                'taker': event['args']['taker'],
-                                'maker_amount': event['args']['makerAmountFilled'],
-                                'taker_amount': event['args']['takerAmountFilled'],
-                                'price': event['args']['takerAmountFilled'] / event['args']['makerAmountFilled'] if event['args']['makerAmountFilled'] > 0 else 0,
+                                'maker': maker_raw,
+                                'taker': taker_raw,
+                                'maker_amount': maker_amount,
+                                'taker_amount': taker_amount,
+                                'price': taker_amount / maker_amount if maker_amount > 0 else 0,
                                 'block_number': event['blockNumber'],
                                 'tx_hash': event['transactionHash'].hex(),
                                 'detection_method': 'polling',